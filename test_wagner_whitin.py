@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+import wagner_whitin_cli
+
+
+@pytest.fixture(params=["wagner_whitin_cli", "wagner_whitin_simple_algoritme"])
+def wagner_whitin(request):
+    """Both scripts carry their own copy of the solver; run every test on each."""
+    if request.param == "wagner_whitin_cli":
+        return wagner_whitin_cli.wagner_whitin
+    return pytest.importorskip(request.param).wagner_whitin
+
+
+def reference_wagner_whitin(demand, setup_cost, holding_cost):
+    """
+    Plain O(T^2) Wagner-Whitin recurrence used as the expected result.
+
+    Holding costs are accumulated per candidate order period instead of being taken
+    from prefix sums, and ties go to the earliest order period.
+    """
+    d = np.asarray(demand, dtype=np.float64)
+    T = len(d)
+    K = np.broadcast_to(np.asarray(setup_cost, dtype=np.float64), (T,))
+    h = np.broadcast_to(np.asarray(holding_cost, dtype=np.float64), (T,))
+
+    C = np.zeros(T + 1)
+    order_period = np.zeros(T + 1, dtype=int)
+    # carry[j] is the holding cost of covering periods j..t-1 from an order in j,
+    # and rate[j] the per-unit cost of carrying stock from j to t-1.
+    carry = np.zeros(T)
+    rate = np.zeros(T)
+    for t in range(1, T + 1):
+        if t >= 2:
+            rate[:t-1] += h[t-2]
+            carry[:t-1] += d[t-1] * rate[:t-1]
+        candidates = C[:t] + K[:t] + carry[:t]
+        j = int(np.argmin(candidates))
+        C[t] = candidates[j]
+        order_period[t] = j + 1
+
+    schedule = []
+    t = T
+    while t > 0:
+        schedule.append(int(order_period[t]))
+        t = order_period[t] - 1
+    return C[T], schedule[::-1]
+
+
+def plan_cost(plan_lines):
+    return sum(float(line.split("(Cost: ")[1].split(")")[0]) for line in plan_lines)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_reference_on_random_demand(wagner_whitin, seed):
+    rng = np.random.default_rng(seed)
+    T = int(rng.integers(1, 60))
+    demand = rng.random(T) * 500
+    setup_cost = float(rng.random() * 1000)
+    holding_cost = float(rng.random() * 5)
+
+    expected_cost, expected_schedule = reference_wagner_whitin(demand, setup_cost, holding_cost)
+    cost, schedule, plan_lines = wagner_whitin(demand, setup_cost, holding_cost)
+
+    assert cost == pytest.approx(expected_cost, rel=1e-12)
+    assert schedule == expected_schedule
+    assert plan_cost(plan_lines) == pytest.approx(cost, abs=0.005 * len(plan_lines))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_reference_with_mostly_zero_demand(wagner_whitin, seed):
+    rng = np.random.default_rng(100 + seed)
+    T = int(rng.integers(2, 60))
+    demand = np.where(rng.random(T) < 0.7, 0.0, rng.integers(1, 300, T).astype(float))
+    demand[int(rng.integers(T))] = 50.0
+
+    expected_cost, expected_schedule = reference_wagner_whitin(demand, 400.0, 1.5)
+    cost, schedule, _ = wagner_whitin(demand, 400.0, 1.5)
+
+    assert cost == pytest.approx(expected_cost, rel=1e-12)
+    assert schedule == expected_schedule
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_reference_with_per_period_costs(wagner_whitin, seed):
+    rng = np.random.default_rng(200 + seed)
+    T = int(rng.integers(1, 60))
+    demand = rng.random(T) * 300
+    demand[rng.random(T) < 0.3] = 0.0
+    demand[int(rng.integers(T))] = 100.0
+    setup_cost = rng.random(T) * 900
+    holding_cost = rng.random(T) * 4
+    holding_cost[rng.random(T) < 0.2] = 0.0
+
+    expected_cost, expected_schedule = reference_wagner_whitin(demand, setup_cost, holding_cost)
+    cost, schedule, _ = wagner_whitin(demand, setup_cost, holding_cost)
+
+    assert cost == pytest.approx(expected_cost, rel=1e-12)
+    assert schedule == expected_schedule
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_ties_keep_the_earlier_order_period(wagner_whitin, seed):
+    # Small integers with dyadic costs keep every sum exact, so equal-cost plans
+    # really are equal and the reference picks the earliest order periods.
+    rng = np.random.default_rng(300 + seed)
+    T = int(rng.integers(1, 50))
+    demand = rng.choice([0.0, 0.0, 4.0, 8.0, 16.0], T)
+    demand[0] = 8.0
+    setup_cost = float(rng.choice([8.0, 16.0, 32.0, 64.0]))
+    holding_cost = float(rng.choice([0.25, 0.5, 1.0, 2.0]))
+
+    expected_cost, expected_schedule = reference_wagner_whitin(demand, setup_cost, holding_cost)
+    cost, schedule, _ = wagner_whitin(demand, setup_cost, holding_cost)
+
+    assert cost == expected_cost
+    assert schedule == expected_schedule
+
+
+def test_ties_survive_rounding_in_prefix_sums(wagner_whitin):
+    # Ordering in period 31 or 32 costs the same, but 2.52 is not exact in binary.
+    demand = [10, 10, 0, 0, 10, 10, 0, 0, 0, 0, 0, 5, 5, 5, 5, 5, 0, 5, 10,
+              0, 0, 0, 10, 10, 10, 0, 5, 5, 5, 0, 5, 10, 0, 10, 0, 0]
+    _, schedule, _ = wagner_whitin(demand, 100.0, 2.52)
+
+    assert schedule == [1, 5, 12, 18, 23, 27, 31]
+
+
+def test_long_horizon_cost_is_exact_to_the_cent(wagner_whitin):
+    T = 20000
+    demand = np.random.default_rng(T).integers(0, 5001, T).astype(float)
+
+    expected_cost, _ = reference_wagner_whitin(demand, 1745.0, 2.52)
+    cost, _, plan_lines = wagner_whitin(demand, 1745.0, 2.52)
+
+    assert "%.2f" % cost == "%.2f" % expected_cost
+    assert len(plan_lines) > 1000
+
+
+def test_rejects_negative_holding_cost(wagner_whitin):
+    with pytest.raises(ValueError):
+        wagner_whitin([10.0, 20.0, 30.0], 50.0, [1.0, -0.5, 1.0])
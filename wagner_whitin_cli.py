@@ -1,24 +1,146 @@
 import numpy as np
 import argparse
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
-# Optimal O(T^2) H-matrix calculation and return detailed plan
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; without it the kernels run as plain Python.
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit("Tuple((float64[:], int32[:]))(float64[:], float64[:], float64[:])", cache=True)
+def _ww_dp(d: np.ndarray, K: np.ndarray, h: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Runs the Wagner-Whitin recurrence in O(T) time and memory.
+
+    Ordering in period j (0-indexed) to cover periods j..t-1 costs
+        C[j] + K[j] + (W[t] - W[j]) - P[j] * (D[t] - D[j])
+    where P[u] sums h over the periods before u, and D[t] and W[t] sum d[u] and
+    d[u] * P[u] over u < t. For a fixed j this is a line in D[t] with slope -P[j].
+    With nonnegative demand and holding costs the slopes never increase with j and
+    D[t] never decreases with t, so the lower envelope of the candidate lines is
+    kept in a deque and each period only drops lines from its front
+    (Wagelmans, van Hoesel and Kolen, 1992).
+
+    C[t] is the minimum cost of covering periods 1..t and order_period[t] is the
+    1-indexed period of the last order in that plan.
+    """
+    T = d.shape[0]
+    # Every period is written exactly once below, so only the start needs a value.
+    C = np.empty(T + 1, dtype=np.float64)
+    order_period = np.empty(T + 1, dtype=np.int32)
+    order_period[0] = -1
+
+    # Candidate line for order period j: intercept[j] + slope[j] * D[t].
+    # hull[head:tail] holds the order periods on the lower envelope, oldest first.
+    slope = np.empty(T)
+    intercept = np.empty(T)
+    hull = np.empty(T, dtype=np.int64)
+    head = 0
+    tail = 0
+
+    C[0] = 0.0
+    P = 0.0
+    D = 0.0
+    W = 0.0
+
+    for t_dp in range(1, T + 1):
+        # Add ordering in period t_dp as a candidate. A line is dropped from the
+        # back once the new one undercuts it everywhere it was the minimum.
+        j = t_dp - 1
+        new_slope = -P
+        new_intercept = C[j] + K[j] - W + P * D
+        add_line = True
+        if tail > head and slope[hull[tail-1]] == new_slope:
+            if new_intercept >= intercept[hull[tail-1]]:
+                add_line = False
+            else:
+                tail -= 1
+        if add_line:
+            while tail - head >= 2:
+                l1 = hull[tail-2]
+                l2 = hull[tail-1]
+                if ((new_intercept - intercept[l1]) * (slope[l1] - slope[l2])
+                        <= (intercept[l2] - intercept[l1]) * (slope[l1] - new_slope)):
+                    tail -= 1
+                else:
+                    break
+            slope[j] = new_slope
+            intercept[j] = new_intercept
+            hull[tail] = j
+            tail += 1
+
+        W += d[j] * P
+        D += d[j]
+        P += h[j]
+
+        # Zero demand adds no holding cost to any candidate, so the plan through
+        # t_dp - 1 also covers t_dp. Period 1 still needs an order of its own.
+        if d[j] == 0.0 and t_dp > 1:
+            C[t_dp] = C[t_dp-1]
+            order_period[t_dp] = order_period[t_dp-1]
+            continue
+
+        # Best order period for covering through t_dp. The intercepts are differences
+        # of large prefix sums, so a later period only takes over once it is cheaper
+        # by more than a few ulps of those sums; exact ties keep the earlier period.
+        while tail - head >= 2:
+            l0 = hull[head]
+            l1 = hull[head+1]
+            cost0 = intercept[l0] + slope[l0] * D
+            cost1 = intercept[l1] + slope[l1] * D
+            tol = 4e-15 * (abs(intercept[l0]) + abs(slope[l0] * D) + abs(W))
+            if cost1 < cost0 - tol:
+                head += 1
+            else:
+                break
+        j_best = hull[head]
+        C[t_dp] = intercept[j_best] + slope[j_best] * D + W
+        order_period[t_dp] = j_best + 1
+
+    return C, order_period
+
+
+@njit("int32[:](int32[:])", cache=True)
+def _ww_schedule(order_period: np.ndarray) -> np.ndarray:
+    """
+    Backtracks order_period from the last period and returns the 1-indexed
+    order periods in increasing order.
+    """
+    T = order_period.shape[0] - 1
+    sched_buf = np.empty(T, dtype=np.int32)
+    n = 0
+    t_backtrack = T
+    while t_backtrack > 0:
+        j_sched = order_period[t_backtrack]
+        sched_buf[n] = j_sched
+        n += 1
+        t_backtrack = j_sched - 1
+    return sched_buf[:n][::-1].copy()
+
+
+# Optimal O(T) recurrence and return detailed plan
 def wagner_whitin(
-    demand: List[float], 
-    setup_cost: List[float], 
-    holding_cost: List[float]
+    demand: Union[List[float], np.ndarray],
+    setup_cost: Union[float, List[float], np.ndarray],
+    holding_cost: Union[float, List[float], np.ndarray]
 ) -> Tuple[float, List[int], List[str]]:
     """
     Solves the Wagner-Whitin lot-sizing problem using dynamic programming.
 
     Parameters
     ----------
-    demand : list of float of length T
+    demand : list or array of float of length T
         demand d_t for periods t = 1..T.
-    setup_cost : list of float of length T
-        fixed ordering cost K_t for each period.
-    holding_cost : list of float of length T
-        per-unit holding cost h_t for carrying inventory from t to t+1.
+    setup_cost : float, or list or array of float of length T
+        fixed ordering cost K_t for each period. A single number applies to
+        every period.
+    holding_cost : float, or list or array of float of length T
+        per-unit holding cost h_t for carrying inventory from t to t+1. A single
+        number applies to every period. Must be nonnegative.
 
     Returns
     -------
@@ -28,58 +150,57 @@ def wagner_whitin(
         List of 1-indexed periods in which orders should be placed.
     detailed_plan_lines : list of str
         A list of strings, where each string describes an order in the plan.
+
+    Raises
+    ------
+    ValueError
+        If any holding cost is negative.
     """
     T = len(demand)
     if T == 0:
         return 0.0, [], ["No demand data provided."]
 
-    d = np.array(demand, dtype=float)
-    K = np.array(setup_cost, dtype=float)
-    h = np.array(holding_cost, dtype=float)
-
-    # Precompute holding cost matrix H[j, t]
-    H = np.zeros((T, T), dtype=float)
-    for j_idx in range(T):
-        current_sum_h_from_j = 0.0
-        for t_idx in range(j_idx + 1, T):
-            current_sum_h_from_j += h[t_idx-1]
-            H[j_idx, t_idx] = H[j_idx, t_idx-1] + d[t_idx] * current_sum_h_from_j
-            
-    # DP arrays
-    C = np.full(T + 1, np.inf)
-    order_period = [-1] * (T + 1)
-    
-    C[0] = 0.0
+    # The compiled kernels take writable contiguous float64 arrays, so read-only
+    # inputs (e.g. np.broadcast_to views) are copied; anything else passes through.
+    d = np.require(demand, np.float64, ['C', 'W'])
+    if not d.any():
+        return 0.0, [], ["No demand in any period. No orders needed."]
 
-    # Recurrence
-    for t_dp in range(1, T + 1):
-        for j_dp in range(1, t_dp + 1):
-            current_total_cost = C[j_dp-1] + K[j_dp-1]
-            if j_dp - 1 < t_dp - 1:
-                current_total_cost += H[j_dp-1, t_dp-1]
-            
-            if current_total_cost < C[t_dp]:
-                C[t_dp] = current_total_cost
-                order_period[t_dp] = j_dp
+    K = np.require(setup_cost, np.float64, ['C', 'W'])
+    h = np.require(holding_cost, np.float64, ['C', 'W'])
+    # The envelope in _ww_dp only holds while P never decreases.
+    if (h < 0).any():
+        raise ValueError("Holding cost cannot be negative.")
 
-    min_total_cost = C[T]
+    C, order_period = _ww_dp(
+        d,
+        np.full(T, K) if K.ndim == 0 else K,
+        np.full(T, h) if h.ndim == 0 else h,
+    )
+    order_periods = _ww_schedule(order_period)
+    schedule = order_periods.tolist()
 
-    # Backtrack to find schedule
-    schedule = []
-    t_backtrack = T
-    while t_backtrack > 0:
-        j_sched = order_period[t_backtrack]
-        schedule.append(j_sched)
-        t_backtrack = j_sched - 1
-    schedule.reverse()
+    # P[u] is the per-unit cost of carrying stock from period 0 to u, so carrying
+    # from j to u costs P[u] - P[j].
+    if h.ndim == 0:
+        P = h * np.arange(T)
+    else:
+        P = np.concatenate(([0.0], np.cumsum(h[:-1])))
+    K = np.broadcast_to(K, (T,))
+
+    # The kernel's C values are differences of large prefix sums, which is fine for
+    # choosing order periods but loses cents on long horizons. Re-add the cost of
+    # each order directly over the periods it covers for the reported total.
+    starts = order_periods - 1
+    order_start = np.repeat(starts, np.diff(np.append(starts, T)))
+    order_costs = K[starts] + np.add.reduceat(d * (P - P[order_start]), starts)
+    min_total_cost = float(order_costs.sum())
 
     # Generate detailed plan
+    D = np.cumsum(d)
     detailed_plan_lines = []
     if not schedule or min_total_cost == np.inf:
-        if np.all(d == 0):
-            detailed_plan_lines.append("No demand in any period. No orders needed.")
-            min_total_cost = 0.0
-        elif min_total_cost == np.inf:
+        if min_total_cost == np.inf:
             detailed_plan_lines.append("Could not find a valid production plan.")
         else:
             detailed_plan_lines.append("No orders are needed.")
@@ -98,10 +219,11 @@ def wagner_whitin(
                 # 0-indexed: T - 1.
                 end_coverage_period_0_idx = T - 1
             
-            # Calculate quantity for this specific order.
+            # Calculate quantity for this specific order from the demand prefix sums.
             # For a valid schedule, order_period_0_idx should be <= end_coverage_period_0_idx.
             if order_period_0_idx <= end_coverage_period_0_idx:
-                 quantity_to_order = np.sum(d[order_period_0_idx : end_coverage_period_0_idx + 1])
+                 quantity_to_order = (D[end_coverage_period_0_idx] - D[order_period_0_idx]
+                                      + d[order_period_0_idx])
             else:
                  # This case should ideally not be reached with a valid Wagner-Whitin schedule.
                  quantity_to_order = 0.0
@@ -114,22 +236,24 @@ def wagner_whitin(
             # and there's actual quantity being held.
             # H[j, t_end] = holding costs for demands d[j+1]...d[t_end] if produced at j.
             if quantity_to_order > 0 and order_period_0_idx < end_coverage_period_0_idx:
-                current_order_holding_cost = H[order_period_0_idx, end_coverage_period_0_idx]
+                j, t_end = order_period_0_idx, end_coverage_period_0_idx
+                current_order_holding_cost = float(d[j:t_end+1] @ (P[j:t_end+1] - P[j]))
             
             current_order_total_cost = current_order_setup_cost + current_order_holding_cost
 
-            line = (f"  Order in Period {order_in_period_1_idx}: "
-                    f"Produce {quantity_to_order:.2f} units (Cost: {current_order_total_cost:.2f}) "
-                    f"to cover demand for periods {order_period_0_idx + 1} to {end_coverage_period_0_idx + 1}.")
+            line = ("  Order in Period %d: Produce %.2f units (Cost: %.2f) "
+                    "to cover demand for periods %d to %d."
+                    % (order_in_period_1_idx, quantity_to_order, current_order_total_cost,
+                       order_period_0_idx + 1, end_coverage_period_0_idx + 1))
             detailed_plan_lines.append(line)
             
     return min_total_cost, schedule, detailed_plan_lines
 
 
 def parse_comma_separated_list(value):
-    """Parse a comma-separated string into a list of floats."""
+    """Parse a comma-separated string into a float64 array."""
     try:
-        return [float(item.strip()) for item in value.split(',')]
+        return np.fromiter((float(item) for item in value.split(',')), dtype=np.float64)
     except ValueError:
         raise argparse.ArgumentTypeError("Invalid format. Use comma-separated numbers (e.g., '10,20,30').")
 
@@ -170,11 +294,11 @@ def main():
         return
 
     # Input validation
-    if not args.demand:
+    if args.demand.size == 0:
         print("Error: Demand list cannot be empty.")
         return
 
-    if any(d < 0 for d in args.demand):
+    if (args.demand < 0).any():
         print("Error: Demand values cannot be negative.")
         return
 
@@ -186,22 +310,19 @@ def main():
         print("Error: Holding cost cannot be negative.")
         return
 
-    # Create arrays for setup cost and holding cost
     num_periods = len(args.demand)
-    setup_cost = [args.setup_cost] * num_periods
-    holding_cost = [args.holding_cost] * num_periods
 
     # Print input summary
     print("\n--- Input Summary ---")
     print(f"Number of periods: {num_periods}")
-    print(f"Total demand: {sum(args.demand):.2f}")
+    print(f"Total demand: {args.demand.sum():.2f}")
     print(f"Setup cost per period: {args.setup_cost:.2f}")
     print(f"Holding cost per unit per period: {args.holding_cost:.2f}")
 
     print("\nCalculating Wagner-Whitin plan...")
     
     try:
-        min_cost, schedule, detailed_plan = wagner_whitin(args.demand, setup_cost, holding_cost)
+        min_cost, schedule, detailed_plan = wagner_whitin(args.demand, args.setup_cost, args.holding_cost)
 
         print("\n--- Results ---")
         print(f"Minimum total cost: {min_cost:.2f}")
@@ -1,24 +1,148 @@
+import functools
+import warnings
 import numpy as np
 import dearpygui.dearpygui as dpg
-from typing import List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Union
 
-# Optimal O(T^2) H-matrix calculation and return detailed plan
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; without it the kernels run as plain Python.
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit("Tuple((float64[:], int32[:]))(float64[:], float64[:], float64[:])", cache=True)
+def _ww_dp(d: np.ndarray, K: np.ndarray, h: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Runs the Wagner-Whitin recurrence in O(T) time and memory.
+
+    Ordering in period j (0-indexed) to cover periods j..t-1 costs
+        C[j] + K[j] + (W[t] - W[j]) - P[j] * (D[t] - D[j])
+    where P[u] sums h over the periods before u, and D[t] and W[t] sum d[u] and
+    d[u] * P[u] over u < t. For a fixed j this is a line in D[t] with slope -P[j].
+    With nonnegative demand and holding costs the slopes never increase with j and
+    D[t] never decreases with t, so the lower envelope of the candidate lines is
+    kept in a deque and each period only drops lines from its front
+    (Wagelmans, van Hoesel and Kolen, 1992).
+
+    C[t] is the minimum cost of covering periods 1..t and order_period[t] is the
+    1-indexed period of the last order in that plan.
+    """
+    T = d.shape[0]
+    # Every period is written exactly once below, so only the start needs a value.
+    C = np.empty(T + 1, dtype=np.float64)
+    order_period = np.empty(T + 1, dtype=np.int32)
+    order_period[0] = -1
+
+    # Candidate line for order period j: intercept[j] + slope[j] * D[t].
+    # hull[head:tail] holds the order periods on the lower envelope, oldest first.
+    slope = np.empty(T)
+    intercept = np.empty(T)
+    hull = np.empty(T, dtype=np.int64)
+    head = 0
+    tail = 0
+
+    C[0] = 0.0
+    P = 0.0
+    D = 0.0
+    W = 0.0
+
+    for t_dp in range(1, T + 1):
+        # Add ordering in period t_dp as a candidate. A line is dropped from the
+        # back once the new one undercuts it everywhere it was the minimum.
+        j = t_dp - 1
+        new_slope = -P
+        new_intercept = C[j] + K[j] - W + P * D
+        add_line = True
+        if tail > head and slope[hull[tail-1]] == new_slope:
+            if new_intercept >= intercept[hull[tail-1]]:
+                add_line = False
+            else:
+                tail -= 1
+        if add_line:
+            while tail - head >= 2:
+                l1 = hull[tail-2]
+                l2 = hull[tail-1]
+                if ((new_intercept - intercept[l1]) * (slope[l1] - slope[l2])
+                        <= (intercept[l2] - intercept[l1]) * (slope[l1] - new_slope)):
+                    tail -= 1
+                else:
+                    break
+            slope[j] = new_slope
+            intercept[j] = new_intercept
+            hull[tail] = j
+            tail += 1
+
+        W += d[j] * P
+        D += d[j]
+        P += h[j]
+
+        # Zero demand adds no holding cost to any candidate, so the plan through
+        # t_dp - 1 also covers t_dp. Period 1 still needs an order of its own.
+        if d[j] == 0.0 and t_dp > 1:
+            C[t_dp] = C[t_dp-1]
+            order_period[t_dp] = order_period[t_dp-1]
+            continue
+
+        # Best order period for covering through t_dp. The intercepts are differences
+        # of large prefix sums, so a later period only takes over once it is cheaper
+        # by more than a few ulps of those sums; exact ties keep the earlier period.
+        while tail - head >= 2:
+            l0 = hull[head]
+            l1 = hull[head+1]
+            cost0 = intercept[l0] + slope[l0] * D
+            cost1 = intercept[l1] + slope[l1] * D
+            tol = 4e-15 * (abs(intercept[l0]) + abs(slope[l0] * D) + abs(W))
+            if cost1 < cost0 - tol:
+                head += 1
+            else:
+                break
+        j_best = hull[head]
+        C[t_dp] = intercept[j_best] + slope[j_best] * D + W
+        order_period[t_dp] = j_best + 1
+
+    return C, order_period
+
+
+@njit("int32[:](int32[:])", cache=True)
+def _ww_schedule(order_period: np.ndarray) -> np.ndarray:
+    """
+    Backtracks order_period from the last period and returns the 1-indexed
+    order periods in increasing order.
+    """
+    T = order_period.shape[0] - 1
+    sched_buf = np.empty(T, dtype=np.int32)
+    n = 0
+    t_backtrack = T
+    while t_backtrack > 0:
+        j_sched = order_period[t_backtrack]
+        sched_buf[n] = j_sched
+        n += 1
+        t_backtrack = j_sched - 1
+    return sched_buf[:n][::-1].copy()
+
+
+# Optimal O(T) recurrence and return detailed plan
 def wagner_whitin(
-    demand: List[float], 
-    setup_cost: List[float], 
-    holding_cost: List[float]
+    demand: Union[List[float], np.ndarray],
+    setup_cost: Union[float, List[float], np.ndarray],
+    holding_cost: Union[float, List[float], np.ndarray]
 ) -> Tuple[float, List[int], List[str]]:
     """
     Solves the Wagner-Whitin lot-sizing problem using dynamic programming.
 
     Parameters
     ----------
-    demand : list of float of length T
+    demand : list or array of float of length T
         demand d_t for periods t = 1..T.
-    setup_cost : list of float of length T
-        fixed ordering cost K_t for each period.
-    holding_cost : list of float of length T
-        per-unit holding cost h_t for carrying inventory from t to t+1.
+    setup_cost : float, or list or array of float of length T
+        fixed ordering cost K_t for each period. A single number applies to
+        every period.
+    holding_cost : float, or list or array of float of length T
+        per-unit holding cost h_t for carrying inventory from t to t+1. A single
+        number applies to every period. Must be nonnegative.
 
     Returns
     -------
@@ -28,58 +152,57 @@ def wagner_whitin(
         List of 1-indexed periods in which orders should be placed.
     detailed_plan_lines : list of str
         A list of strings, where each string describes an order in the plan.
+
+    Raises
+    ------
+    ValueError
+        If any holding cost is negative.
     """
     T = len(demand)
     if T == 0:
         return 0.0, [], ["No demand data provided."]
 
-    d = np.array(demand, dtype=float)
-    K = np.array(setup_cost, dtype=float)
-    h = np.array(holding_cost, dtype=float)
-
-    # Precompute holding cost matrix H[j, t]
-    H = np.zeros((T, T), dtype=float)
-    for j_idx in range(T):
-        current_sum_h_from_j = 0.0
-        for t_idx in range(j_idx + 1, T):
-            current_sum_h_from_j += h[t_idx-1]
-            H[j_idx, t_idx] = H[j_idx, t_idx-1] + d[t_idx] * current_sum_h_from_j
-            
-    # DP arrays
-    C = np.full(T + 1, np.inf)
-    order_period = [-1] * (T + 1)
-    
-    C[0] = 0.0
-
-    # Recurrence
-    for t_dp in range(1, T + 1):
-        for j_dp in range(1, t_dp + 1):
-            current_total_cost = C[j_dp-1] + K[j_dp-1]
-            if j_dp -1 < t_dp -1:
-                current_total_cost += H[j_dp-1, t_dp-1]
-            
-            if current_total_cost < C[t_dp]:
-                C[t_dp] = current_total_cost
-                order_period[t_dp] = j_dp
+    # The compiled kernels take writable contiguous float64 arrays, so read-only
+    # inputs (e.g. np.broadcast_to views) are copied; anything else passes through.
+    d = np.require(demand, np.float64, ['C', 'W'])
+    if not d.any():
+        return 0.0, [], ["No demand in any period. No orders needed."]
+
+    K = np.require(setup_cost, np.float64, ['C', 'W'])
+    h = np.require(holding_cost, np.float64, ['C', 'W'])
+    # The envelope in _ww_dp only holds while P never decreases.
+    if (h < 0).any():
+        raise ValueError("Holding cost cannot be negative.")
+
+    C, order_period = _ww_dp(
+        d,
+        np.full(T, K) if K.ndim == 0 else K,
+        np.full(T, h) if h.ndim == 0 else h,
+    )
+    order_periods = _ww_schedule(order_period)
+    schedule = order_periods.tolist()
+
+    # P[u] is the per-unit cost of carrying stock from period 0 to u, so carrying
+    # from j to u costs P[u] - P[j].
+    if h.ndim == 0:
+        P = h * np.arange(T)
+    else:
+        P = np.concatenate(([0.0], np.cumsum(h[:-1])))
+    K = np.broadcast_to(K, (T,))
 
-    min_total_cost = C[T]
-
-    # Backtrack to find schedule
-    schedule = []
-    t_backtrack = T
-    while t_backtrack > 0:
-        j_sched = order_period[t_backtrack]
-        schedule.append(j_sched)
-        t_backtrack = j_sched - 1
-    schedule.reverse()
+    # The kernel's C values are differences of large prefix sums, which is fine for
+    # choosing order periods but loses cents on long horizons. Re-add the cost of
+    # each order directly over the periods it covers for the reported total.
+    starts = order_periods - 1
+    order_start = np.repeat(starts, np.diff(np.append(starts, T)))
+    order_costs = K[starts] + np.add.reduceat(d * (P - P[order_start]), starts)
+    min_total_cost = float(order_costs.sum())
 
     # Generate detailed plan
+    D = np.cumsum(d)
     detailed_plan_lines = []
     if not schedule or min_total_cost == np.inf:
-        if np.all(d == 0):
-            detailed_plan_lines.append("No demand in any period. No orders needed.")
-            min_total_cost = 0.0
-        elif min_total_cost == np.inf:
+        if min_total_cost == np.inf:
             detailed_plan_lines.append("Could not find a valid production plan.")
         else:
             detailed_plan_lines.append("No orders are needed.")
@@ -98,10 +221,11 @@ def wagner_whitin(
                 # 0-indexed: T - 1.
                 end_coverage_period_0_idx = T - 1
             
-            # Calculate quantity for this specific order.
+            # Calculate quantity for this specific order from the demand prefix sums.
             # For a valid schedule, order_period_0_idx should be <= end_coverage_period_0_idx.
             if order_period_0_idx <= end_coverage_period_0_idx:
-                 quantity_to_order = np.sum(d[order_period_0_idx : end_coverage_period_0_idx + 1])
+                 quantity_to_order = (D[end_coverage_period_0_idx] - D[order_period_0_idx]
+                                      + d[order_period_0_idx])
             else:
                  # This case should ideally not be reached with a valid Wagner-Whitin schedule.
                  quantity_to_order = 0.0
@@ -114,13 +238,15 @@ def wagner_whitin(
             # and there's actual quantity being held.
             # H[j, t_end] = holding costs for demands d[j+1]...d[t_end] if produced at j.
             if quantity_to_order > 0 and order_period_0_idx < end_coverage_period_0_idx:
-                current_order_holding_cost = H[order_period_0_idx, end_coverage_period_0_idx]
+                j, t_end = order_period_0_idx, end_coverage_period_0_idx
+                current_order_holding_cost = float(d[j:t_end+1] @ (P[j:t_end+1] - P[j]))
             
             current_order_total_cost = current_order_setup_cost + current_order_holding_cost
 
-            line = (f"  Order in Period {order_in_period_1_idx}: "
-                    f"Produce {quantity_to_order:.2f} units (Cost: {current_order_total_cost:.2f}) "
-                    f"to cover demand for periods {order_period_0_idx + 1} to {end_coverage_period_0_idx + 1}.")
+            line = ("  Order in Period %d: Produce %.2f units (Cost: %.2f) "
+                    "to cover demand for periods %d to %d."
+                    % (order_in_period_1_idx, quantity_to_order, current_order_total_cost,
+                       order_period_0_idx + 1, end_coverage_period_0_idx + 1))
             detailed_plan_lines.append(line)
             
     return min_total_cost, schedule, detailed_plan_lines
@@ -134,14 +260,35 @@ def _help_text(message: str):
     with dpg.tooltip(dpg.last_item()):
         dpg.add_text(message)
 
-def parse_input_string(input_str: str) -> Optional[List[float]]:
-    """Parses a comma-separated string of numbers into a list of floats."""
+# Latest text of each input field, mirrored by _store_input_callback so that
+# calculating does not have to query the widgets.
+_input_values = {"demand_input": "", "setup_cost_input": "", "holding_cost_input": ""}
+
+def _store_input_callback(sender: Any, app_data: Any, user_data: Any):
+    """Mirrors an input field's new text into _input_values (user_data is the field tag)."""
+    _input_values[user_data] = app_data
+
+def _set_input(tag: str, value: str):
+    """Sets an input field and its mirrored value; dpg.set_value does not fire callbacks."""
+    dpg.set_value(tag, value)
+    _input_values[tag] = value
+
+def parse_input_string(input_str: str) -> Optional[np.ndarray]:
+    """Parses a comma-separated string of numbers into a float64 array."""
     if not input_str.strip():
-        return []
+        return np.empty(0)
     try:
-        return [float(x.strip()) for x in input_str.split(',')]
-    except ValueError:
+        with warnings.catch_warnings():
+            # NumPy < 2 only warns on unparsable text and returns the numbers read
+            # before it, so treat that warning as a parse failure too
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(input_str, dtype=np.float64, sep=',')
+    except (ValueError, DeprecationWarning):
+        return None
+    # Also rejects empty fields such as a trailing comma, which fromstring skips
+    if values.size != input_str.count(',') + 1:
         return None
+    return values
 
 _example_demand = [172, 183, 173, 233, 229, 239, 257, 251, 650, 636, 662, 674, 643]
 _example_setup_cost_single_val = 1745
@@ -150,9 +297,9 @@ _example_holding_cost_single_val = 2.52
 def use_example_data_callback(sender: Any, app_data: Any, user_data: Any):
     """Populates input fields with example data."""
     demand_str = ", ".join(map(str, _example_demand))
-    dpg.set_value("demand_input", demand_str)
-    dpg.set_value("setup_cost_input", str(_example_setup_cost_single_val))
-    dpg.set_value("holding_cost_input", str(_example_holding_cost_single_val))
+    _set_input("demand_input", demand_str)
+    _set_input("setup_cost_input", str(_example_setup_cost_single_val))
+    _set_input("holding_cost_input", str(_example_holding_cost_single_val))
     dpg.set_value("status_text", "Example data loaded. Click 'Calculate'.")
     dpg.set_value("result_cost_text", "Minimum total cost: -")
     dpg.set_value("result_schedule_text", "Order schedule: -")
@@ -160,21 +307,34 @@ def use_example_data_callback(sender: Any, app_data: Any, user_data: Any):
 
 def clear_input_callback(sender: Any, app_data: Any, user_data: Any):
     """Clears all input fields and resets result and status texts."""
-    dpg.set_value("demand_input", "")
-    dpg.set_value("setup_cost_input", "")
-    dpg.set_value("holding_cost_input", "")
+    _set_input("demand_input", "")
+    _set_input("setup_cost_input", "")
+    _set_input("holding_cost_input", "")
     dpg.set_value("status_text", "Inputs cleared.")
     dpg.set_value("result_cost_text", "Minimum total cost: -")
     dpg.set_value("result_schedule_text", "Order schedule: -")
     dpg.set_value("result_plan_text", "")
 
-def calculate_callback(sender: Any, app_data: Any, user_data: Any):
-    """Callback for the Calculate button."""
-    dpg.set_value("status_text", "Calculating...")
+@functools.lru_cache(maxsize=4)
+def _cached_wagner_whitin(
+    demand: Tuple[float, ...],
+    setup_cost: float,
+    holding_cost: float
+) -> Tuple[float, Tuple[int, ...], Tuple[str, ...]]:
+    """
+    Memoizes wagner_whitin so clicking Calculate again on unchanged inputs skips the solver.
+
+    Each entry keeps the demand tuple and one plan line per order, which runs to tens of
+    megabytes on long horizons, so only the last few input sets are kept.
+    """
+    min_cost, schedule, detailed_plan = wagner_whitin(list(demand), setup_cost, holding_cost)
+    return min_cost, tuple(schedule), tuple(detailed_plan)
 
-    demand_str = dpg.get_value("demand_input")
-    setup_cost_single_str = dpg.get_value("setup_cost_input")
-    holding_cost_single_str = dpg.get_value("holding_cost_input")
+def _calculate_updates() -> Dict[str, str]:
+    """Validates the inputs, runs the solver and returns the new text for each widget to update."""
+    demand_str = _input_values["demand_input"]
+    setup_cost_single_str = _input_values["setup_cost_input"]
+    holding_cost_single_str = _input_values["holding_cost_input"]
 
     demand = parse_input_string(demand_str)
     
@@ -207,52 +367,55 @@ def calculate_callback(sender: Any, app_data: Any, user_data: Any):
 
 
     if error_messages:
-        dpg.set_value("status_text", "Error: " + " | ".join(error_messages))
-        return
+        return {"status_text": "Error: " + " | ".join(error_messages)}
 
     if demand is None:
-        dpg.set_value("status_text", "Error: Critical input error.")
-        return
+        return {"status_text": "Error: Critical input error."}
 
-    if not demand:
+    if demand.size == 0:
         error_messages.append("Demand data cannot be empty.")
-    else:
-        num_periods = len(demand)
-        setup_cost = [setup_cost_single] * num_periods
-        holding_cost = [holding_cost_single] * num_periods
-        
-        if any(d < 0 for d in demand):
-             error_messages.append("Demand values cannot be negative.")
+    elif (demand < 0).any():
+        error_messages.append("Demand values cannot be negative.")
 
     if error_messages:
-        dpg.set_value("status_text", "Error: " + " | ".join(error_messages))
-        return
+        return {"status_text": "Error: " + " | ".join(error_messages)}
     
-    if not demand:
-        dpg.set_value("status_text", "No data to process.")
-        dpg.set_value("result_cost_text", "Minimum total cost: -")
-        dpg.set_value("result_schedule_text", "Order schedule: -")
-        dpg.set_value("result_plan_text", "")
-        return
+    if demand.size == 0:
+        return {
+            "status_text": "No data to process.",
+            "result_cost_text": "Minimum total cost: -",
+            "result_schedule_text": "Order schedule: -",
+            "result_plan_text": "",
+        }
 
     try:
-        min_cost, schedule, detailed_plan = wagner_whitin(demand, setup_cost, holding_cost)
-
-        dpg.set_value("result_cost_text", f"Minimum total cost: {min_cost:.2f}")
-        if schedule:
-            dpg.set_value("result_schedule_text", "Order schedule (1-indexed periods): " + ", ".join(map(str, schedule)))
-        else:
-            dpg.set_value("result_schedule_text", "Order schedule: No orders needed or plan not found.")
-        
-        dpg.set_value("result_plan_text", "\n".join(detailed_plan))
-        dpg.set_value("status_text", "Calculation complete.")
-
+        min_cost, schedule, detailed_plan = _cached_wagner_whitin(
+            tuple(demand.tolist()), setup_cost_single, holding_cost_single
+        )
     except Exception as e:
-        dpg.set_value("status_text", f"An error occurred during calculation: {e}")
-        dpg.set_value("result_cost_text", "Minimum total cost: -")
-        dpg.set_value("result_schedule_text", "Order schedule: -")
-        dpg.set_value("result_plan_text", "")
+        return {
+            "status_text": f"An error occurred during calculation: {e}",
+            "result_cost_text": "Minimum total cost: -",
+            "result_schedule_text": "Order schedule: -",
+            "result_plan_text": "",
+        }
+
+    if schedule:
+        schedule_text = "Order schedule (1-indexed periods): " + ", ".join(map(str, schedule))
+    else:
+        schedule_text = "Order schedule: No orders needed or plan not found."
+
+    return {
+        "status_text": "Calculation complete.",
+        "result_cost_text": f"Minimum total cost: {min_cost:.2f}",
+        "result_schedule_text": schedule_text,
+        "result_plan_text": "\n".join(detailed_plan),
+    }
 
+def calculate_callback(sender: Any, app_data: Any, user_data: Any):
+    """Callback for the Calculate button. Each widget is updated once, after validation and solving."""
+    for tag, value in _calculate_updates().items():
+        dpg.set_value(tag, value)
 
 if __name__ == "__main__":
     dpg.create_context()
@@ -309,17 +472,17 @@ if __name__ == "__main__":
         with dpg.group(horizontal=True):
             dpg.add_text("Demand (comma-separated):")
             _help_text("Enter demand for each period, e.g., 20, 0, 30, 10")
-        dpg.add_input_text(tag="demand_input", width=-1)
+        dpg.add_input_text(tag="demand_input", width=-1, callback=_store_input_callback, user_data="demand_input")
 
         with dpg.group(horizontal=True):
             dpg.add_text("Setup Cost (per period):")
             _help_text("Enter a single fixed setup cost, e.g., 100")
-        dpg.add_input_text(tag="setup_cost_input", width=-1)
+        dpg.add_input_text(tag="setup_cost_input", width=-1, callback=_store_input_callback, user_data="setup_cost_input")
 
         with dpg.group(horizontal=True):
             dpg.add_text("Holding Cost (per unit, per period):")
             _help_text("Enter a single per-unit holding cost, e.g., 2")
-        dpg.add_input_text(tag="holding_cost_input", width=-1)
+        dpg.add_input_text(tag="holding_cost_input", width=-1, callback=_store_input_callback, user_data="holding_cost_input")
         
         dpg.add_spacer(height=10)
         with dpg.group(horizontal=True):